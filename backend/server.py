@@ -1,7 +1,9 @@
-from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException, Header
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from dotenv import load_dotenv
+from jinja2 import Environment, FileSystemLoader
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
@@ -13,19 +15,57 @@ from datetime import datetime, timezone
 import pandas as pd
 import numpy as np
 from scipy import stats
+from numba import njit
 import re
 import io
 import json
+import orjson
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from collections import OrderedDict
+import tempfile
+from bson.binary import Binary
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# Keep warm connections around for bursty report/dataset reads; zlib is the
+# fallback compressor when zstandard is not installed
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=50,
+    minPoolSize=10,
+    maxIdleTimeMS=60000,
+    serverSelectionTimeoutMS=3000,
+    connectTimeoutMS=3000,
+    compressors='zstd,zlib',
+)
 db = client[os.environ['DB_NAME']]
 
-app = FastAPI(title="DQ Sentinel API")
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+class SafeORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that falls back to str() for values orjson cannot encode natively"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=_ORJSON_OPTIONS)
+
+
+app = FastAPI(title="DQ Sentinel API", default_response_class=SafeORJSONResponse)
+
+# HTML report templates (autoescaped so user-supplied values are safe)
+templates = Environment(loader=FileSystemLoader(ROOT_DIR / 'templates'), autoescape=True)
+report_template = templates.get_template('report.html.j2')
+
+# Completed runs never change, so rendered reports are cached by ETag (LRU)
+REPORT_CACHE_SIZE = 256
+REPORT_CACHE_CONTROL = "private, max-age=3600"  # per-run user data; keep out of shared caches
+_report_html_cache: "OrderedDict[str, str]" = OrderedDict()
 
 @app.get("/health")
 def health():
@@ -77,273 +117,399 @@ class RunListItem(BaseModel):
 
 # ============= DQ Rules Engine =============
 
+# Regex patterns compiled once and shared across runs
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_RE = re.compile(r'^[\d\s\-\(\)\+]{7,20}$')
+_ZIP_RE = re.compile(r'^\d{5}(-\d{4})?$')  # US ZIP
+
+# Arrow-backed string dtype used for text columns in the rules engine
+_ARROW_STRING = 'string[pyarrow]'
+
+# Below this many rows the hashed/numba/thread-pool paths cost more than they
+# save, so rules stay on plain pandas and run inline
+SMALL_DATASET_ROWS = 1000
+
+# Column-name keywords used to discover columns for the regex and date rules
+_COLUMN_KEYWORDS = {
+    'email': ('email',),
+    'phone': ('phone',),
+    'zip': ('zip', 'postal'),
+    'date': ('date', 'time'),
+}
+
+# Compiled without a nested parallel region: rules already run on a thread
+# pool, and nogil lets this kernel overlap with the other rule threads
+@njit(nogil=True, cache=True)
+def _iqr_outlier_stats(arr, q1, q3):
+    """Compute IQR bounds and count values outside them in one fused pass (NaN never counts)"""
+    iqr = q3 - q1
+    lower = q1 - 1.5 * iqr
+    upper = q3 + 1.5 * iqr
+    count = 0
+    for i in range(arr.shape[0]):
+        if arr[i] < lower or arr[i] > upper:
+            count += 1
+    return lower, upper, count
+
+
+def _df_to_clean_records(sub_df: pd.DataFrame, limit: int = 5) -> List[Dict]:
+    """Convert the first rows of a DataFrame to JSON-safe records (NaN/inf -> None)"""
+    sample = sub_df.head(limit).replace([np.inf, -np.inf], np.nan)
+    return sample.astype(object).where(pd.notna(sample), None).to_dict('records')
+
+
 class DQRulesEngine:
     """Data Quality Rules Engine with 10 configurable rules"""
     
     def __init__(self, df: pd.DataFrame, config: Optional[Dict] = None):
-        self.df = df
         self.config = config or {}
         self.results = []
+        
+        # Cache row count and column selections shared across rules
+        self._n = len(df)
+        self._small = self._n < SMALL_DATASET_ROWS
+        self._numeric_cols = df.select_dtypes(include=[np.number]).columns
+        self._object_cols = pd.Index([c for c in df.columns if pd.api.types.is_string_dtype(df[c].dtype)])
+        
+        # Convert text columns to Arrow-backed strings once so the regex and
+        # categorical rules can use .str directly instead of re-casting per rule
+        self.df = df.astype({c: _ARROW_STRING for c in self._object_cols}) if len(self._object_cols) else df
+        self._col_lower = {c: c.lower() for c in df.columns}
+        self._cols_by_keyword = {group: [] for group in _COLUMN_KEYWORDS}
+        for col, col_lower in self._col_lower.items():
+            for group, keywords in _COLUMN_KEYWORDS.items():
+                if any(kw in col_lower for kw in keywords):
+                    self._cols_by_keyword[group].append(col)
     
     def run_all_rules(self, previous_row_count: Optional[int] = None) -> List[Dict]:
         """Run all DQ rules and return results"""
-        self.results = []
-        
-        # Rule 1: Required fields null rate
-        self.check_null_rate()
-        
-        # Rule 2: Duplicate row detection
-        self.check_duplicates()
-        
-        # Rule 3: Unique key check (id column)
-        self.check_unique_key()
-        
-        # Rule 4: Numeric range validation
-        self.check_numeric_range()
-        
-        # Rule 5: Regex validation (email)
-        self.check_email_regex()
-        
-        # Rule 6: Regex validation (phone or zip)
-        self.check_phone_zip_regex()
+        if self._n == 0:
+            self.results = self._skip_empty_dataset(previous_row_count)
+            return self.results
         
-        # Rule 7: Date parse validation
-        self.check_date_validation()
+        # Shared min/max/quartile stats for rules 4 and 10
+        numeric_stats = self._numeric_stats()
         
-        # Rule 8: Allowed categorical values
-        self.check_categorical_values()
+        checks = [
+            self.check_null_rate,  # Rule 1: Required fields null rate
+            self.check_duplicates,  # Rule 2: Duplicate row detection
+            self.check_unique_key,  # Rule 3: Unique key check (id column)
+            partial(self.check_numeric_range, numeric_stats),  # Rule 4: Numeric range validation
+            self.check_email_regex,  # Rule 5: Regex validation (email)
+            self.check_phone_zip_regex,  # Rule 6: Regex validation (phone or zip)
+            self.check_date_validation,  # Rule 7: Date parse validation
+            self.check_categorical_values,  # Rule 8: Allowed categorical values
+            partial(self.check_outliers, numeric_stats),  # Rule 10: Outlier detection (IQR)
+        ]
         
-        # Rule 9: Row count anomaly vs previous run
-        self.check_row_count_anomaly(previous_row_count)
-        
-        # Rule 10: Outlier detection (IQR)
-        self.check_outliers()
+        if self._small:
+            rule_results = [check() for check in checks]
+            # Rule 9: Row count anomaly vs previous run
+            row_count_results = self.check_row_count_anomaly(previous_row_count)
+        else:
+            # Independent column scans run on a thread pool; pandas releases the
+            # GIL in most vectorized kernels, so rules overlap across cores
+            with ThreadPoolExecutor(max_workers=min(len(checks), os.cpu_count() or 1)) as executor:
+                futures = [executor.submit(check) for check in checks]
+                
+                # Rule 9: Row count anomaly vs previous run (trivial, stays inline)
+                row_count_results = self.check_row_count_anomaly(previous_row_count)
+                
+                rule_results = [future.result() for future in futures]
         
+        # Concatenate in rule order
+        rule_results.insert(8, row_count_results)
+        self.results = [result for results in rule_results for result in results]
         return self.results
     
-    def _add_result(self, rule_name: str, status: str, metric: float, threshold: float, 
-                   sample_rows: List[Dict], description: str):
-        # Clean sample rows - replace NaN/inf with None
-        cleaned_rows = []
-        for row in sample_rows[:5]:
-            cleaned_row = {}
-            for k, v in row.items():
-                if pd.isna(v) or (isinstance(v, float) and (np.isinf(v) or np.isnan(v))):
-                    cleaned_row[k] = None
-                else:
-                    cleaned_row[k] = v
-            cleaned_rows.append(cleaned_row)
+    def _skip_empty_dataset(self, previous_row_count: Optional[int]) -> List[Dict]:
+        """Skip every column rule on a dataset with no rows; row count anomaly still applies"""
+        results: List[Dict] = []
+        for rule_name in ("Null Rate", "Duplicate Rows", "Unique Key Check", "Numeric Range",
+                          "Email Validation", "Phone/ZIP Validation", "Date Validation",
+                          "Categorical Validation"):
+            self._add_result(results, rule_name, "SKIP", 0, 1.0, [], "Dataset has no rows")
         
+        results.extend(self.check_row_count_anomaly(previous_row_count))
+        self._add_result(results, "Outlier Detection", "SKIP", 0, 1.0, [], "Dataset has no rows")
+        return results
+    
+    def _numeric_stats(self) -> pd.DataFrame:
+        """Compute min/max and quartiles for the checked numeric columns in one pass"""
+        cols = self._numeric_cols[:3]
+        if len(cols) == 0:
+            return pd.DataFrame()
+        return self.df[cols].describe(percentiles=[.25, .75])
+    
+    def _column_stat(self, numeric_stats: pd.DataFrame, stat: str, col: str):
+        """Read a describe() stat back in the column's own type (describe upcasts to float)"""
+        value = numeric_stats.at[stat, col]
+        return self.df[col].dtype.type(value) if pd.notna(value) else value
+    
+    def _regex_valid(self, col: str, pattern: re.Pattern) -> pd.Series:
+        """Match a column against a regex using Arrow's compiled (RE2) string kernels"""
+        values = self.df[col]
+        if values.dtype != _ARROW_STRING:
+            # Non-text columns (e.g. numeric ZIP codes) still need a cast
+            values = values.astype(_ARROW_STRING)
+        return values.str.match(pattern.pattern).fillna(False).astype(bool)
+    
+    def _first_k_violation_indices(self, mask, k: int = 5) -> List[int]:
+        """Return the positions of up to k rows flagged by mask without filtering the whole frame"""
+        if isinstance(mask, pd.Series):
+            mask = mask.to_numpy(dtype=bool, na_value=False)
+        return np.flatnonzero(mask)[:k].tolist()
+    
+    def _add_result(self, results: List[Dict], rule_name: str, status: str, metric: float,
+                    threshold: float, sample_indices: List[int], description: str):
         # Clean metric value
-        clean_metric = 0.0 if (pd.isna(metric) or np.isinf(metric)) else round(metric, 4)
+        clean_metric = 0.0 if not np.isfinite(metric) else round(float(metric), 4)
         
-        self.results.append({
+        results.append({
             "rule_name": rule_name,
             "status": status,
             "metric": clean_metric,
             "threshold": threshold,
-            "sample_rows": cleaned_rows,
+            "sample_row_indices": sample_indices,
             "description": description
         })
     
-    def check_null_rate(self):
+    def check_null_rate(self) -> List[Dict]:
         """Rule 1: Check null rate in required fields"""
+        results: List[Dict] = []
         threshold = self.config.get("null_rate_threshold", 0.05)
         required_cols = self.config.get("required_columns", list(self.df.columns)[:3])
         
+        # De-duplicate (request-supplied) names so each selects a single column
+        required_cols = [col for col in dict.fromkeys(required_cols) if col in self.df.columns]
+        
+        # One vectorized isna pass over all required columns
+        na = self.df[required_cols].isna()
+        null_counts = na.sum(axis=0)
+        
         for col in required_cols:
-            if col not in self.df.columns:
-                continue
-            null_rate = self.df[col].isna().sum() / len(self.df)
+            null_rate = null_counts[col] / self._n
             status = "PASS" if null_rate <= threshold else "FAIL"
             
-            null_rows = self.df[self.df[col].isna()].head(5).to_dict('records')
+            null_indices = self._first_k_violation_indices(na[col])
             self._add_result(
+                results,
                 f"Null Rate: {col}",
-                status, null_rate, threshold, null_rows,
+                status, null_rate, threshold, null_indices,
                 f"Checks that column '{col}' has <= {threshold*100}% null values"
             )
+        
+        return results
     
-    def check_duplicates(self):
+    def check_duplicates(self) -> List[Dict]:
         """Rule 2: Detect duplicate rows"""
+        results: List[Dict] = []
         threshold = self.config.get("duplicate_threshold", 0.0)
-        duplicates = self.df.duplicated(keep=False)
-        dup_rate = duplicates.sum() / len(self.df)
+        if self._small:
+            duplicates = self.df.duplicated(keep=False)
+        else:
+            # 64-bit row hashes computed in C; rows sharing a hash are duplicates
+            row_hashes = pd.util.hash_pandas_object(self.df, index=False).to_numpy()
+            _, inverse, counts = np.unique(row_hashes, return_inverse=True, return_counts=True)
+            duplicates = counts[inverse] > 1
+        dup_rate = duplicates.sum() / self._n
         status = "PASS" if dup_rate <= threshold else "FAIL"
         
-        dup_rows = self.df[duplicates].head(5).to_dict('records')
+        dup_indices = self._first_k_violation_indices(duplicates)
         self._add_result(
+            results,
             "Duplicate Rows",
-            status, dup_rate, threshold, dup_rows,
+            status, dup_rate, threshold, dup_indices,
             "Detects fully duplicate rows in the dataset"
         )
+        
+        return results
     
-    def check_unique_key(self):
+    def check_unique_key(self) -> List[Dict]:
         """Rule 3: Check unique key constraint (id column)"""
+        results: List[Dict] = []
         id_cols = ['id', 'ID', 'order_id', 'customer_id', 'product_id']
         id_col = next((c for c in id_cols if c in self.df.columns), None)
         
         if id_col is None:
             self._add_result(
+                results,
                 "Unique Key Check",
                 "SKIP", 0, 1.0, [],
                 "No ID column found to check uniqueness"
             )
-            return
+            return results
         
-        total = len(self.df)
-        unique = self.df[id_col].nunique()
+        total = self._n
+        # Single hash pass over the id column; NaN is kept so repeated missing
+        # ids are flagged as duplicates but excluded from the unique count
+        vc = self.df[id_col].value_counts(dropna=False)
+        unique = int(vc.index.notna().sum())
         uniqueness_rate = unique / total if total > 0 else 1.0
         status = "PASS" if uniqueness_rate >= 1.0 else "FAIL"
         
-        duplicated_ids = self.df[self.df[id_col].duplicated(keep=False)]
-        dup_rows = duplicated_ids.head(5).to_dict('records')
+        dup_ids = vc.index[vc > 1]
+        dup_indices = self._first_k_violation_indices(self.df[id_col].isin(dup_ids))
         
         self._add_result(
+            results,
             f"Unique Key: {id_col}",
-            status, uniqueness_rate, 1.0, dup_rows,
+            status, uniqueness_rate, 1.0, dup_indices,
             f"Checks that '{id_col}' contains unique values"
         )
+        
+        return results
     
-    def check_numeric_range(self):
+    def check_numeric_range(self, numeric_stats: Optional[pd.DataFrame] = None) -> List[Dict]:
         """Rule 4: Numeric range validation"""
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        results: List[Dict] = []
+        if numeric_stats is None:
+            numeric_stats = self._numeric_stats()
         
-        for col in numeric_cols[:3]:  # Check first 3 numeric columns
-            min_val = self.config.get(f"{col}_min", self.df[col].min())
-            max_val = self.config.get(f"{col}_max", self.df[col].max())
+        for col in self._numeric_cols[:3]:  # Check first 3 numeric columns
+            min_val = self.config.get(f"{col}_min", self._column_stat(numeric_stats, 'min', col))
+            max_val = self.config.get(f"{col}_max", self._column_stat(numeric_stats, 'max', col))
             
             # Use reasonable defaults for common columns
-            if 'price' in col.lower() or 'amount' in col.lower():
+            col_lower = self._col_lower[col]
+            if 'price' in col_lower or 'amount' in col_lower:
                 min_val = 0
                 max_val = self.config.get(f"{col}_max", 100000)
-            elif 'quantity' in col.lower() or 'qty' in col.lower():
+            elif 'quantity' in col_lower or 'qty' in col_lower:
                 min_val = 0
                 max_val = self.config.get(f"{col}_max", 10000)
-            elif 'age' in col.lower():
+            elif 'age' in col_lower:
                 min_val = 0
                 max_val = 120
             
-            out_of_range = self.df[(self.df[col] < min_val) | (self.df[col] > max_val)]
-            violation_rate = len(out_of_range) / len(self.df)
+            out_of_range = (self.df[col] < min_val) | (self.df[col] > max_val)
+            violation_rate = out_of_range.sum() / self._n
             status = "PASS" if violation_rate == 0 else "FAIL"
             
             self._add_result(
+                results,
                 f"Numeric Range: {col}",
-                status, violation_rate, 0.0, out_of_range.head(5).to_dict('records'),
+                status, violation_rate, 0.0, self._first_k_violation_indices(out_of_range),
                 f"Checks that '{col}' values are within [{min_val}, {max_val}]"
             )
+        
+        return results
     
-    def check_email_regex(self):
+    def check_email_regex(self) -> List[Dict]:
         """Rule 5: Email regex validation"""
-        email_cols = [c for c in self.df.columns if 'email' in c.lower()]
+        results: List[Dict] = []
+        email_cols = self._cols_by_keyword['email']
         
         if not email_cols:
             self._add_result(
+                results,
                 "Email Validation",
                 "SKIP", 0, 1.0, [],
                 "No email column found"
             )
-            return
-        
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+            return results
         
         for col in email_cols:
-            valid = self.df[col].astype(str).str.match(email_pattern, na=False)
-            invalid_rate = (~valid).sum() / len(self.df)
+            valid = self._regex_valid(col, _EMAIL_RE)
+            invalid_rate = (~valid).sum() / self._n
             status = "PASS" if invalid_rate == 0 else "FAIL"
             
-            invalid_rows = self.df[~valid].head(5).to_dict('records')
+            invalid_indices = self._first_k_violation_indices(~valid)
             self._add_result(
+                results,
                 f"Email Regex: {col}",
-                status, invalid_rate, 0.0, invalid_rows,
+                status, invalid_rate, 0.0, invalid_indices,
                 f"Validates email format in '{col}'"
             )
+        
+        return results
     
-    def check_phone_zip_regex(self):
+    def check_phone_zip_regex(self) -> List[Dict]:
         """Rule 6: Phone or ZIP code regex validation"""
-        phone_cols = [c for c in self.df.columns if 'phone' in c.lower()]
-        zip_cols = [c for c in self.df.columns if 'zip' in c.lower() or 'postal' in c.lower()]
+        results: List[Dict] = []
+        phone_cols = self._cols_by_keyword['phone']
+        zip_cols = self._cols_by_keyword['zip']
         
         if phone_cols:
-            phone_pattern = r'^[\d\s\-\(\)\+]{7,20}$'
             for col in phone_cols:
-                valid = self.df[col].astype(str).str.match(phone_pattern, na=False)
-                invalid_rate = (~valid).sum() / len(self.df)
+                valid = self._regex_valid(col, _PHONE_RE)
+                invalid_rate = (~valid).sum() / self._n
                 status = "PASS" if invalid_rate == 0 else "FAIL"
                 
                 self._add_result(
+                    results,
                     f"Phone Regex: {col}",
                     status, invalid_rate, 0.0, 
-                    self.df[~valid].head(5).to_dict('records'),
+                    self._first_k_violation_indices(~valid),
                     f"Validates phone number format in '{col}'"
                 )
         
         if zip_cols:
-            zip_pattern = r'^\d{5}(-\d{4})?$'  # US ZIP
             for col in zip_cols:
-                valid = self.df[col].astype(str).str.match(zip_pattern, na=False)
-                invalid_rate = (~valid).sum() / len(self.df)
+                valid = self._regex_valid(col, _ZIP_RE)
+                invalid_rate = (~valid).sum() / self._n
                 status = "PASS" if invalid_rate == 0 else "FAIL"
                 
                 self._add_result(
+                    results,
                     f"ZIP Regex: {col}",
                     status, invalid_rate, 0.0,
-                    self.df[~valid].head(5).to_dict('records'),
+                    self._first_k_violation_indices(~valid),
                     f"Validates ZIP code format in '{col}'"
                 )
         
         if not phone_cols and not zip_cols:
             self._add_result(
+                results,
                 "Phone/ZIP Validation",
                 "SKIP", 0, 1.0, [],
                 "No phone or ZIP column found"
             )
+        
+        return results
     
-    def check_date_validation(self):
+    def check_date_validation(self) -> List[Dict]:
         """Rule 7: Date parse validation (no invalid/future dates)"""
-        date_cols = [c for c in self.df.columns if 'date' in c.lower() or 'time' in c.lower()]
+        results: List[Dict] = []
+        date_cols = self._cols_by_keyword['date']
         
         if not date_cols:
             self._add_result(
+                results,
                 "Date Validation",
                 "SKIP", 0, 1.0, [],
                 "No date column found"
             )
-            return
+            return results
         
-        today = datetime.now(timezone.utc).date()
+        today = pd.Timestamp(datetime.now(timezone.utc).date(), tz='UTC')
         
         for col in date_cols:
-            invalid_rows = []
-            invalid_count = 0
-            
-            for idx, val in self.df[col].items():
-                try:
-                    if pd.isna(val):
-                        invalid_count += 1
-                        continue
-                    parsed = pd.to_datetime(val)
-                    if parsed.date() > today:
-                        invalid_count += 1
-                        invalid_rows.append(self.df.loc[idx].to_dict())
-                except Exception:
-                    invalid_count += 1
-                    invalid_rows.append(self.df.loc[idx].to_dict())
-            
-            invalid_rate = invalid_count / len(self.df)
+            # Unparseable values coerce to NaT, so one vectorized parse covers
+            # both missing and malformed dates
+            parsed = pd.to_datetime(self.df[col], errors='coerce', utc=True, format='mixed')
+            nan_mask = parsed.isna()
+            future_mask = (parsed.dt.normalize() > today).fillna(False)
+            invalid_mask = nan_mask | future_mask
+
+            invalid_count = int(invalid_mask.sum())
+            invalid_indices = self._first_k_violation_indices(invalid_mask)
+
+            invalid_rate = invalid_count / self._n
             status = "PASS" if invalid_rate == 0 else "FAIL"
-            
+
             self._add_result(
+                results,
                 f"Date Validation: {col}",
-                status, invalid_rate, 0.0, invalid_rows[:5],
+                status, invalid_rate, 0.0, invalid_indices,
                 f"Validates date format and no future dates in '{col}'"
             )
+        
+        return results
     
-    def check_categorical_values(self):
+    def check_categorical_values(self) -> List[Dict]:
         """Rule 8: Allowed categorical values validation"""
-        categorical_cols = self.df.select_dtypes(include=['object']).columns
-        
+        results: List[Dict] = []
         # Common categorical columns with expected values
         expected_values = {
             'status': ['pending', 'completed', 'shipped', 'cancelled', 'processing', 'delivered'],
@@ -354,8 +520,8 @@ class DQRulesEngine:
         }
         
         found_categorical = False
-        for col in categorical_cols:
-            col_lower = col.lower()
+        for col in self._object_cols:
+            col_lower = self._col_lower[col]
             for key, allowed in expected_values.items():
                 if key in col_lower:
                     found_categorical = True
@@ -363,38 +529,47 @@ class DQRulesEngine:
                         # Infer allowed values from most common
                         allowed = self.df[col].value_counts().head(10).index.tolist()
                     
-                    allowed_lower = [str(v).lower() for v in allowed]
-                    valid = self.df[col].astype(str).str.lower().isin(allowed_lower)
-                    invalid_rate = (~valid).sum() / len(self.df)
+                    # Unique lowercase categories; values outside them get code -1
+                    allowed_lower = list(dict.fromkeys(str(v).lower() for v in allowed))
+                    series_lc = self.df[col].str.lower()
+                    codes = pd.Categorical(series_lc, categories=allowed_lower).codes
+                    invalid_mask = codes == -1
+                    invalid_rate = invalid_mask.sum() / self._n
                     status = "PASS" if invalid_rate == 0 else "FAIL"
                     
                     self._add_result(
+                        results,
                         f"Categorical: {col}",
                         status, invalid_rate, 0.0,
-                        self.df[~valid].head(5).to_dict('records'),
+                        self._first_k_violation_indices(invalid_mask),
                         f"Validates allowed values in '{col}'"
                     )
                     break
         
         if not found_categorical:
             self._add_result(
+                results,
                 "Categorical Validation",
                 "SKIP", 0, 1.0, [],
                 "No recognized categorical column found"
             )
+        
+        return results
     
-    def check_row_count_anomaly(self, previous_count: Optional[int]):
+    def check_row_count_anomaly(self, previous_count: Optional[int]) -> List[Dict]:
         """Rule 9: Row count anomaly vs previous run"""
+        results: List[Dict] = []
         threshold = self.config.get("row_count_threshold", 0.3)
-        current_count = len(self.df)
+        current_count = self._n
         
         if previous_count is None:
             self._add_result(
+                results,
                 "Row Count Anomaly",
                 "SKIP", 0, threshold, [],
                 "No previous run to compare row count"
             )
-            return
+            return results
         
         if previous_count == 0:
             change_rate = 1.0 if current_count > 0 else 0.0
@@ -404,122 +579,260 @@ class DQRulesEngine:
         status = "PASS" if change_rate <= threshold else "FAIL"
         
         self._add_result(
+            results,
             "Row Count Anomaly",
             status, change_rate, threshold, [],
             f"Current: {current_count}, Previous: {previous_count}, Change: {change_rate*100:.1f}%"
         )
+        
+        return results
     
-    def check_outliers(self):
+    def check_outliers(self, numeric_stats: Optional[pd.DataFrame] = None) -> List[Dict]:
         """Rule 10: Outlier detection using IQR"""
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-        
-        if len(numeric_cols) == 0:
+        results: List[Dict] = []
+        if len(self._numeric_cols) == 0:
             self._add_result(
+                results,
                 "Outlier Detection",
                 "SKIP", 0, 0.05, [],
                 "No numeric columns for outlier detection"
             )
-            return
+            return results
         
         threshold = self.config.get("outlier_threshold", 0.05)
+        if numeric_stats is None:
+            numeric_stats = self._numeric_stats()
         
-        for col in numeric_cols[:2]:  # Check first 2 numeric columns
-            Q1 = self.df[col].quantile(0.25)
-            Q3 = self.df[col].quantile(0.75)
-            IQR = Q3 - Q1
+        for col in self._numeric_cols[:2]:  # Check first 2 numeric columns
+            Q1 = numeric_stats.at['25%', col]
+            Q3 = numeric_stats.at['75%', col]
             
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            outliers = self.df[(self.df[col] < lower_bound) | (self.df[col] > upper_bound)]
-            outlier_rate = len(outliers) / len(self.df)
+            values = self.df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            if self._small:
+                IQR = Q3 - Q1
+                lower_bound = Q1 - 1.5 * IQR
+                upper_bound = Q3 + 1.5 * IQR
+                outlier_count = int(((values < lower_bound) | (values > upper_bound)).sum())
+            else:
+                lower_bound, upper_bound, outlier_count = _iqr_outlier_stats(values, float(Q1), float(Q3))
+            outlier_rate = outlier_count / self._n
             status = "PASS" if outlier_rate <= threshold else "FAIL"
             
+            # Only build a mask when there are outlier rows to sample
+            outlier_indices = []
+            if outlier_count:
+                outlier_indices = self._first_k_violation_indices((values < lower_bound) | (values > upper_bound))
+            
             self._add_result(
+                results,
                 f"Outliers: {col}",
                 status, outlier_rate, threshold,
-                outliers.head(5).to_dict('records'),
+                outlier_indices,
                 f"Detects outliers in '{col}' using IQR method"
             )
+        
+        return results
+
+
+def _run_dq_engine(df: pd.DataFrame, config: Optional[Dict], previous_row_count: Optional[int]) -> List[Dict]:
+    """Build the engine and run all rules; kept together so both run off the event loop"""
+    return DQRulesEngine(df, config).run_all_rules(previous_row_count)
 
 
 # ============= Demo Data Generator =============
 
 def generate_ecommerce_demo_data(num_rows: int = 100) -> pd.DataFrame:
     """Generate e-commerce dataset with intentional data quality issues"""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     # Generate base data
-    order_ids = list(range(1, num_rows + 1))
+    order_ids = np.arange(1, num_rows + 1)
     # Add duplicate IDs (intentional issue)
-    order_ids[10] = order_ids[5]
-    order_ids[20] = order_ids[15]
+    order_ids[[10, 20]] = order_ids[[5, 15]]
     
-    customers = [f"customer_{i}" for i in np.random.randint(1, 50, num_rows)]
+    # String columns are built with vectorized np.char ops, then switched to
+    # object arrays so injected values are not truncated to the array's width
+    customers = np.char.add('customer_', rng.integers(1, 50, num_rows).astype(str)).astype(object)
     
     products = ['Laptop', 'Phone', 'Tablet', 'Headphones', 'Monitor', 'Keyboard', 'Mouse', 'Camera']
-    product_names = np.random.choice(products, num_rows)
+    product_names = rng.choice(products, num_rows).astype(object)
     
     # Prices with some outliers (intentional issue)
-    prices = np.random.uniform(10, 500, num_rows)
+    prices = rng.uniform(10, 500, num_rows)
     prices[5] = -50  # Negative price (issue)
     prices[15] = 99999  # Extreme outlier (issue)
     
-    quantities = np.random.randint(1, 10, num_rows)
+    quantities = rng.integers(1, 10, num_rows)
     quantities[25] = -1  # Negative quantity (issue)
     
     # Emails with some invalid ones (intentional issue)
-    emails = [f"user{i}@example.com" for i in range(num_rows)]
-    emails[8] = "invalid-email"
-    emails[18] = "missing@domain"
-    emails[28] = "@nodomain.com"
+    emails = np.char.add(np.char.add('user', np.arange(num_rows).astype(str)), '@example.com').astype(object)
+    emails[[8, 18, 28]] = ["invalid-email", "missing@domain", "@nodomain.com"]
     
     # Phone numbers with some invalid (intentional issue)
-    phones = [f"555-{np.random.randint(100, 999)}-{np.random.randint(1000, 9999)}" for _ in range(num_rows)]
+    phones = np.char.add(
+        np.char.add('555-', rng.integers(100, 999, num_rows).astype(str)),
+        np.char.add('-', rng.integers(1000, 9999, num_rows).astype(str))
+    ).astype(object)
     phones[12] = "123"  # Too short
     phones[22] = "abc-def-ghij"  # Not a number
     
     # Dates with some invalid/future (intentional issue)
-    base_date = datetime(2024, 1, 1)
-    dates = [(base_date + pd.Timedelta(days=int(d))).strftime('%Y-%m-%d') 
-             for d in np.random.randint(0, 365, num_rows)]
+    dates = (np.datetime64('2024-01-01') + rng.integers(0, 365, num_rows)).astype(str).astype(object)
     dates[3] = "2030-12-31"  # Future date (issue)
     dates[13] = "invalid-date"  # Invalid date (issue)
     
     # Status with some invalid values (intentional issue)
-    statuses = np.random.choice(['pending', 'completed', 'shipped', 'cancelled'], num_rows)
-    statuses = list(statuses)
+    statuses = rng.choice(['pending', 'completed', 'shipped', 'cancelled'], num_rows).astype(object)
     statuses[7] = "UNKNOWN_STATUS"  # Invalid status (issue)
     statuses[17] = "InvalidValue"  # Invalid status (issue)
     
     # ZIP codes with some invalid (intentional issue)
-    zips = [f"{np.random.randint(10000, 99999)}" for _ in range(num_rows)]
+    zips = rng.integers(10000, 99999, num_rows).astype(str).astype(object)
     zips[9] = "ABC"  # Invalid ZIP
     zips[19] = "1234"  # Too short
     
-    # Add some null values (intentional issue)
-    df = pd.DataFrame({
-        'order_id': order_ids,
-        'customer_id': customers,
-        'product': product_names,
-        'price': prices,
-        'quantity': quantities,
-        'email': emails,
-        'phone': phones,
-        'order_date': dates,
-        'status': statuses,
-        'zip_code': zips
-    })
+    # Add null values (intentional issue)
+    customers[4] = None
+    product_names[14] = None
+    emails[24] = None
+    
+    # Add duplicate rows by repeating rows 30 and 31
+    rows = np.concatenate([np.arange(num_rows), [30, 31]])
     
-    # Add null values
-    df.loc[4, 'customer_id'] = None
-    df.loc[14, 'product'] = None
-    df.loc[24, 'email'] = None
+    return pd.DataFrame({
+        'order_id': order_ids[rows],
+        'customer_id': customers[rows],
+        'product': product_names[rows],
+        'price': prices[rows],
+        'quantity': quantities[rows],
+        'email': emails[rows],
+        'phone': phones[rows],
+        'order_date': dates[rows],
+        'status': statuses[rows],
+        'zip_code': zips[rows]
+    })
+
+
+# ============= Dataset Storage =============
+
+# Sample rows are persisted as a Parquet blob: columnar, dtype-preserving
+# and NaN-safe, so no per-cell cleanup is needed before storing in MongoDB
+SAMPLE_ROW_LIMIT = 1000
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MB
+
+
+def _dedupe_column_names(names: List[str]) -> List[str]:
+    """Rename repeated headers the way pd.read_csv does (email, email.1, ...)"""
+    header = set(names)
+    used: set = set()
+    counts: Dict[str, int] = {}
+    deduped = []
+    for name in names:
+        new_name = name
+        if name in used:
+            # Skip suffixes already taken by another header or an earlier rename
+            count = counts.get(name, 1)
+            while f"{name}.{count}" in header or f"{name}.{count}" in used:
+                count += 1
+            counts[name] = count + 1
+            new_name = f"{name}.{count}"
+        used.add(new_name)
+        deduped.append(new_name)
+    return deduped
+
+
+def _read_csv_arrow(source) -> pd.DataFrame:
+    """Parse a CSV with Arrow's multi-threaded reader into Arrow-backed pandas columns"""
+    try:
+        table = pacsv.read_csv(
+            source,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=True),
+        )
+    except pa.ArrowInvalid as e:
+        # Arrow rejects messy files (ragged rows, duplicate headers) that pandas
+        # tolerates; those are exactly the data-quality issues we report on
+        logger.info(f"Arrow CSV parse failed ({e}); falling back to pandas")
+        source.seek(0)
+        return pd.read_csv(source)
+    # Arrow keeps repeated header names; pandas conversion would reject them
+    if len(set(table.column_names)) != table.num_columns:
+        table = table.rename_columns(_dedupe_column_names(table.column_names))
+    # Keep date/time columns as text like pd.read_csv does; Rule 7 parses them
+    # itself and datetime.date/time values are not BSON-encodable
+    for i, field in enumerate(table.schema):
+        if pa.types.is_temporal(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _df_to_parquet_blob(df: pd.DataFrame) -> Binary:
+    """Serialize a DataFrame to a zstd-compressed Parquet blob for MongoDB"""
+    buf = io.BytesIO()
+    df.to_parquet(buf, engine='pyarrow', compression='zstd', index=False)
+    return Binary(buf.getvalue())
+
+
+def _load_sample_df(dataset: Dict[str, Any]) -> pd.DataFrame:
+    """Rebuild the stored sample DataFrame for a dataset document"""
+    if "sample_parquet" in dataset:
+        return pd.read_parquet(io.BytesIO(dataset["sample_parquet"]), engine='pyarrow')
+    # Datasets stored before the Parquet layout kept JSON records
+    return pd.DataFrame(dataset.get("sample_rows", []))
+
+
+def _attach_sample_rows(results: List[Dict], df: pd.DataFrame) -> List[Dict]:
+    """Resolve each result's sample_row_indices into cleaned rows of the dataset sample"""
+    all_indices = sorted({
+        i for result in results for i in result.get("sample_row_indices", []) if i < len(df)
+    })
+    rows = {}
+    if all_indices:
+        rows = dict(zip(all_indices, _df_to_clean_records(df.iloc[all_indices], len(all_indices))))
     
-    # Add duplicate rows
-    df = pd.concat([df, df.iloc[[30, 31]]], ignore_index=True)
+    for result in results:
+        if "sample_row_indices" in result:
+            result["sample_rows"] = [rows[i] for i in result.pop("sample_row_indices") if i in rows]
+    return results
+
+
+def _attach_sample_from_dataset(results: List[Dict], dataset: Optional[Dict]) -> List[Dict]:
+    """Decode a dataset's stored sample and attach sample rows to its results"""
+    df = _load_sample_df(dataset) if dataset else pd.DataFrame()
+    return _attach_sample_rows(results, df)
+
+
+async def _hydrate_results(results: List[Dict], dataset_id: str,
+                           dataset: Optional[Dict] = None) -> List[Dict]:
+    """Load a dataset's stored sample once and attach sample rows to its stored results"""
+    # Results stored before index-only persistence already embed sample_rows
+    if not any("sample_row_indices" in result for result in results):
+        return results
     
-    return df
+    if dataset is None:
+        dataset = await db.datasets.find_one(
+            {"dataset_id": dataset_id},
+            {"_id": 0, "sample_parquet": 1, "sample_rows": 1}
+        )
+    # Parquet decode and record building are CPU-bound; keep them off the event loop
+    return await asyncio.to_thread(_attach_sample_from_dataset, results, dataset)
+
+
+async def _find_run_with_results(run_id: str) -> Optional[Dict]:
+    """Fetch a run and its stored results in one round-trip via $lookup"""
+    runs = await db.runs.aggregate([
+        {"$match": {"run_id": run_id}},
+        {"$limit": 1},
+        {"$lookup": {
+            "from": "dq_results",
+            "localField": "run_id",
+            "foreignField": "run_id",
+            "as": "results",
+        }},
+        {"$project": {"_id": 0, "results._id": 0}},
+    ]).to_list(1)
+    return runs[0] if runs else None
 
 
 # ============= API Endpoints =============
@@ -536,26 +849,21 @@ async def upload_csv(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Only CSV files are supported")
     
     try:
-        contents = await file.read()
-        df = pd.read_csv(io.BytesIO(contents))
+        # Spool the upload in chunks; large files roll over to disk
+        with tempfile.SpooledTemporaryFile(max_size=64 * UPLOAD_CHUNK_SIZE) as tmp:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                tmp.write(chunk)
+            tmp.seek(0)
+            df = await asyncio.to_thread(_read_csv_arrow, tmp)
         
         dataset_id = str(uuid.uuid4())
         
-        # Store sample rows (up to 1000)
-        sample_rows = df.head(1000).to_dict('records')
-        
-        # Clean sample rows for MongoDB (convert NaN to None)
-        for row in sample_rows:
-            for key, value in row.items():
-                if pd.isna(value):
-                    row[key] = None
-        
         dataset_doc = {
             "dataset_id": dataset_id,
             "filename": file.filename,
             "columns": list(df.columns),
             "row_count": len(df),
-            "sample_rows": sample_rows,
+            "sample_parquet": await asyncio.to_thread(_df_to_parquet_blob, df.head(SAMPLE_ROW_LIMIT)),
             "created_at": datetime.now(timezone.utc).isoformat()
         }
         
@@ -590,8 +898,8 @@ async def run_dq_checks(config: RunConfig):
     start_time = datetime.now(timezone.utc)
     
     try:
-        # Reconstruct DataFrame from sample rows
-        df = pd.DataFrame(dataset["sample_rows"])
+        # Reconstruct DataFrame from the stored sample
+        df = await asyncio.to_thread(_load_sample_df, dataset)
         
         # Get previous run row count for anomaly detection
         previous_run = await db.runs.find_one(
@@ -602,8 +910,7 @@ async def run_dq_checks(config: RunConfig):
         previous_row_count = previous_run.get("row_count") if previous_run else None
         
         # Run DQ engine
-        engine = DQRulesEngine(df, config.rules_config)
-        results = engine.run_all_rules(previous_row_count)
+        results = await asyncio.to_thread(_run_dq_engine, df, config.rules_config, previous_row_count)
         
         # Calculate summary
         total_rules = len(results)
@@ -634,15 +941,13 @@ async def run_dq_checks(config: RunConfig):
                 "duration_ms": int((end_time - start_time).total_seconds() * 1000)
             }
         }
-        await db.runs.insert_one(run_doc)
+        # Store DQ results in a single round-trip, before the run doc so a
+        # listed run always has its full result set
+        result_docs = [{"run_id": run_id, **result} for result in results]
+        if result_docs:
+            await db.dq_results.insert_many(result_docs)
         
-        # Store DQ results
-        for result in results:
-            result_doc = {
-                "run_id": run_id,
-                **result
-            }
-            await db.dq_results.insert_one(result_doc)
+        await db.runs.insert_one(run_doc)
         
         return {
             "run_id": run_id,
@@ -651,21 +956,27 @@ async def run_dq_checks(config: RunConfig):
             "created_at": run_doc["created_at"],
             "completed_at": run_doc["completed_at"],
             "summary": run_doc["summary"],
-            "results": results
+            "results": _attach_sample_rows([dict(result) for result in results], df)
         }
     
     except Exception as e:
         logger.error(f"Error running DQ checks: {e}")
-        # Store failed run
-        await db.runs.insert_one({
-            "run_id": run_id,
-            "dataset_id": config.dataset_id,
-            "filename": dataset["filename"],
-            "status": "failed",
-            "created_at": start_time.isoformat(),
-            "error": str(e),
-            "summary": {"error": str(e)}
-        })
+        # Store failed run; upsert since the run doc may already exist (run_id is unique)
+        await db.runs.update_one(
+            {"run_id": run_id},
+            {
+                "$set": {
+                    "dataset_id": config.dataset_id,
+                    "filename": dataset["filename"],
+                    "status": "failed",
+                    "created_at": start_time.isoformat(),
+                    "error": str(e),
+                    "summary": {"error": str(e)}
+                },
+                "$unset": {"completed_at": "", "timings": ""}
+            },
+            upsert=True
+        )
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -677,20 +988,13 @@ async def run_demo():
         df = generate_ecommerce_demo_data(100)
         dataset_id = str(uuid.uuid4())
         
-        # Clean data for MongoDB
-        sample_rows = df.to_dict('records')
-        for row in sample_rows:
-            for key, value in row.items():
-                if pd.isna(value):
-                    row[key] = None
-        
         # Store dataset
         dataset_doc = {
             "dataset_id": dataset_id,
             "filename": "demo_ecommerce_data.csv",
             "columns": list(df.columns),
             "row_count": len(df),
-            "sample_rows": sample_rows,
+            "sample_parquet": await asyncio.to_thread(_df_to_parquet_blob, df),
             "created_at": datetime.now(timezone.utc).isoformat(),
             "is_demo": True
         }
@@ -717,35 +1021,34 @@ async def get_runs():
 @api_router.get("/runs/{run_id}")
 async def get_run(run_id: str):
     """Get a specific run with its results"""
-    run = await db.runs.find_one({"run_id": run_id}, {"_id": 0})
+    run = await _find_run_with_results(run_id)
     
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     
-    # Get results
-    results = await db.dq_results.find({"run_id": run_id}, {"_id": 0}).to_list(100)
+    results = await _hydrate_results(run.pop("results"), run["dataset_id"])
     
-    return {
+    # Return the response directly so FastAPI skips jsonable_encoder
+    return SafeORJSONResponse(content={
         **run,
         "results": results
-    }
+    })
 
 
 @api_router.get("/report/{run_id}")
 async def get_report_json(run_id: str):
     """Get DQ report as JSON"""
-    run = await db.runs.find_one({"run_id": run_id}, {"_id": 0})
+    run = await _find_run_with_results(run_id)
     
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     
-    results = await db.dq_results.find({"run_id": run_id}, {"_id": 0}).to_list(100)
-    
-    # Get dataset info
-    dataset = await db.datasets.find_one(
-        {"dataset_id": run["dataset_id"]},
-        {"_id": 0, "sample_rows": 0}
-    )
+    # Read the dataset once: its sample hydrates the results, the rest is report metadata
+    dataset = await db.datasets.find_one({"dataset_id": run["dataset_id"]}, {"_id": 0})
+    results = await _hydrate_results(run.pop("results"), run["dataset_id"], dataset)
+    if dataset:
+        dataset.pop("sample_parquet", None)
+        dataset.pop("sample_rows", None)
     
     report = {
         "report_type": "DQ Sentinel Report",
@@ -755,148 +1058,120 @@ async def get_report_json(run_id: str):
         "results": results
     }
     
-    return JSONResponse(content=report)
+    return SafeORJSONResponse(content=report)
 
 
 @api_router.get("/report/{run_id}/html", response_class=HTMLResponse)
-async def get_report_html(run_id: str):
+async def get_report_html(run_id: str, if_none_match: Optional[str] = Header(None)):
     """Get DQ report as HTML"""
-    run = await db.runs.find_one({"run_id": run_id}, {"_id": 0})
+    run = await db.runs.find_one(
+        {"run_id": run_id},
+        {"_id": 0, "status": 1, "summary": 1, "completed_at": 1}
+    )
     
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     
+    # Weak validator: the body is re-encoded by the gzip middleware
+    etag = f'W/"{run_id}:{run.get("completed_at", "")}"'
+    headers = {"ETag": etag, "Cache-Control": REPORT_CACHE_CONTROL}
+    
+    # ETags are only issued for complete reports, so a match means the client has one
+    if if_none_match and run.get("status") == "completed" and (
+            if_none_match.strip() == "*" or
+            etag in (tag.strip() for tag in if_none_match.split(","))):
+        return Response(status_code=304, headers=headers)
+    
+    html = _report_html_cache.get(etag)
+    if html is not None:
+        _report_html_cache.move_to_end(etag)
+        return HTMLResponse(html, headers=headers)
+    
     results = await db.dq_results.find({"run_id": run_id}, {"_id": 0}).to_list(100)
     
-    # Generate HTML report
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>DQ Sentinel Report - {run_id[:8]}</title>
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ font-family: 'Inter', -apple-system, sans-serif; background: #F8FAFC; color: #0F172A; padding: 40px; }}
-            .container {{ max-width: 1200px; margin: 0 auto; }}
-            h1 {{ font-family: 'Chivo', sans-serif; font-weight: 900; font-size: 2.5rem; margin-bottom: 8px; }}
-            h2 {{ font-family: 'Chivo', sans-serif; font-weight: 700; font-size: 1.5rem; margin: 24px 0 16px; }}
-            .subtitle {{ color: #64748B; margin-bottom: 32px; }}
-            .summary {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 16px; margin-bottom: 32px; }}
-            .card {{ background: white; border: 1px solid #E2E8F0; border-radius: 8px; padding: 20px; }}
-            .card-label {{ font-size: 0.875rem; color: #64748B; margin-bottom: 4px; }}
-            .card-value {{ font-size: 2rem; font-weight: 700; }}
-            .score {{ color: #2563EB; }}
-            .passed {{ color: #10B981; }}
-            .failed {{ color: #EF4444; }}
-            table {{ width: 100%; border-collapse: collapse; background: white; border: 1px solid #E2E8F0; border-radius: 8px; overflow: hidden; }}
-            th {{ background: #F8FAFC; text-align: left; padding: 12px 16px; font-size: 0.75rem; text-transform: uppercase; letter-spacing: 0.05em; border-bottom: 1px solid #E2E8F0; }}
-            td {{ padding: 12px 16px; border-bottom: 1px solid #E2E8F0; font-size: 0.875rem; }}
-            tr:last-child td {{ border-bottom: none; }}
-            .badge {{ display: inline-block; padding: 4px 10px; border-radius: 9999px; font-size: 0.75rem; font-weight: 500; }}
-            .badge-pass {{ background: #D1FAE5; color: #065F46; }}
-            .badge-fail {{ background: #FEE2E2; color: #991B1B; }}
-            .badge-skip {{ background: #F1F5F9; color: #64748B; }}
-            .mono {{ font-family: 'JetBrains Mono', monospace; font-size: 0.75rem; }}
-            .footer {{ margin-top: 40px; text-align: center; color: #64748B; font-size: 0.875rem; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>DQ Sentinel Report</h1>
-            <p class="subtitle">Run ID: <span class="mono">{run_id}</span> | Generated: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}</p>
-            
-            <div class="summary">
-                <div class="card">
-                    <div class="card-label">Overall Score</div>
-                    <div class="card-value score">{run.get('summary', {}).get('score', 0)}%</div>
-                </div>
-                <div class="card">
-                    <div class="card-label">Passed</div>
-                    <div class="card-value passed">{run.get('summary', {}).get('passed', 0)}</div>
-                </div>
-                <div class="card">
-                    <div class="card-label">Failed</div>
-                    <div class="card-value failed">{run.get('summary', {}).get('failed', 0)}</div>
-                </div>
-                <div class="card">
-                    <div class="card-label">Total Rules</div>
-                    <div class="card-value">{run.get('summary', {}).get('total_rules', 0)}</div>
-                </div>
-            </div>
-            
-            <h2>Rule Results</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Rule Name</th>
-                        <th>Status</th>
-                        <th>Metric</th>
-                        <th>Threshold</th>
-                        <th>Description</th>
-                    </tr>
-                </thead>
-                <tbody>
-    """
+    now = datetime.now(timezone.utc)
+    html = report_template.render(
+        run_id=run_id,
+        summary=run.get('summary', {}),
+        results=results,
+        generated_at=now.strftime('%Y-%m-%d %H:%M UTC'),
+        generated_year=now.year,
+    )
     
-    for result in results:
-        status_class = f"badge-{result['status'].lower()}"
-        html += f"""
-                    <tr>
-                        <td class="mono">{result['rule_name']}</td>
-                        <td><span class="badge {status_class}">{result['status']}</span></td>
-                        <td class="mono">{result['metric']}</td>
-                        <td class="mono">{result['threshold']}</td>
-                        <td>{result['description']}</td>
-                    </tr>
-        """
-    
-    html += f"""
-                </tbody>
-            </table>
-            
-            <div class="footer">
-                <p>Generated by DQ Sentinel | {datetime.now(timezone.utc).strftime('%Y')}</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    # Only a completed run with its full result set is immutable and cacheable
+    if run.get("status") != "completed" or len(results) != run.get("summary", {}).get("total_rules"):
+        return HTMLResponse(html, headers={"Cache-Control": "no-store"})
     
-    return HTMLResponse(content=html)
+    _report_html_cache[etag] = html
+    if len(_report_html_cache) > REPORT_CACHE_SIZE:
+        _report_html_cache.popitem(last=False)
+    return HTMLResponse(html, headers=headers)
 
 
 @api_router.get("/datasets")
 async def get_datasets():
     """Get all datasets"""
-    datasets = await db.datasets.find(
+    # Include-only projection so the stored sample blobs are never read
+    cursor = db.datasets.find(
         {},
-        {"_id": 0, "sample_rows": 0}
-    ).sort("created_at", -1).to_list(100)
-    return {"datasets": datasets}
+        {"_id": 0, "dataset_id": 1, "filename": 1, "columns": 1, "row_count": 1, "created_at": 1}
+    ).sort("created_at", -1).limit(100)
+    
+    async def stream():
+        # Encode each document as the cursor yields it instead of building a list
+        yield b'{"datasets":['
+        sep = b''
+        async for doc in cursor:
+            yield sep + orjson.dumps(doc, default=str, option=_ORJSON_OPTIONS)
+            sep = b','
+        yield b']}'
+    
+    return StreamingResponse(stream(), media_type="application/json")
 
 
 # Include router and middleware
 app.include_router(api_router)
 
+# Origins are normalised once; a wildcard can't be combined with credentials,
+# so it takes Starlette's plain "*" path instead of echoing each Origin back
+CORS_ORIGINS = sorted({o.strip() for o in os.environ.get('CORS_ORIGINS', '*').split(',') if o.strip()})
+if '*' in CORS_ORIGINS:
+    CORS_ORIGINS = ['*']
+
 app.add_middleware(
     CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+    allow_credentials=CORS_ORIGINS != ['*'],
+    allow_origins=CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress report/JSON payloads; tiny responses aren't worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+async def _ensure_unique_run_id_index():
+    """Create the unique runs.run_id index, replacing a legacy non-unique one"""
+    indexes = await db.runs.index_information()
+    legacy = indexes.get("run_id_1")
+    if legacy and not legacy.get("unique"):
+        # Same key with new options is rejected by MongoDB, so drop it first
+        logger.info("Replacing non-unique runs.run_id index with a unique one")
+        await db.runs.drop_index("run_id_1")
+    await db.runs.create_index("run_id", unique=True)
+
 
 # Create indexes on startup
 @app.on_event("startup")
 async def startup_db():
-    # Create indexes
-    await db.runs.create_index("created_at")
-    await db.runs.create_index("run_id")
-    await db.dq_results.create_index("run_id")
-    await db.datasets.create_index("dataset_id")
+    # Create indexes concurrently; startup waits only on the slowest one
+    await asyncio.gather(
+        db.runs.create_index("created_at"),
+        _ensure_unique_run_id_index(),
+        db.dq_results.create_index("run_id"),
+        db.datasets.create_index("dataset_id"),
+        db.datasets.create_index([("created_at", -1)]),
+    )
     logger.info("Database indexes created")
 
 
@@ -4,15 +4,30 @@ DQ Sentinel Backend API Testing Suite
 Tests all backend endpoints for the Data Quality monitoring tool
 """
 
-import requests
+import asyncio
+import contextvars
+import httpx
 import sys
 import json
 import io
+import re
 import csv
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+try:
+    import h2  # noqa: F401  (httpx[http2] extra)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Output buffer of the test group running in the current task (None: print directly)
+_log_buffer: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar('log_buffer', default=None)
+
 class DQSentinelAPITester:
+    # Fail fast on stalled handshakes, allow slow DQ runs
+    DEFAULT_TIMEOUT = httpx.Timeout(27, connect=3.05)
+    
     def __init__(self, base_url="https://quality-check-25.preview.emergentagent.com/api"):
         self.base_url = base_url
         self.tests_run = 0
@@ -20,32 +35,64 @@ class DQSentinelAPITester:
         self.demo_run_id = None
         self.uploaded_dataset_id = None
         self.upload_run_id = None
+        
+        # Pooled keep-alive client shared by all tests, including concurrent ones.
+        # Over HTTP/2 the concurrent probes multiplex on a single TLS connection.
+        # Pool/protocol options go on the transport: the client ignores them
+        # when a custom transport is passed.
+        self.client = httpx.AsyncClient(
+            timeout=self.DEFAULT_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+                retries=2,
+            ),
+        )
+
+    def emit(self, line: str):
+        """Print a line, or buffer it while a concurrent test group is running"""
+        buffer = _log_buffer.get()
+        if buffer is None:
+            print(line)
+        else:
+            buffer.append(line)
+
+    async def run_buffered(self, coro):
+        """Await a test group and emit its output as one block when it finishes"""
+        buffer = []
+        token = _log_buffer.set(buffer)
+        try:
+            return await coro
+        finally:
+            _log_buffer.reset(token)
+            for line in buffer:
+                self.emit(line)
 
     def log_test(self, name: str, success: bool, details: str = ""):
         """Log test result"""
         self.tests_run += 1
         if success:
             self.tests_passed += 1
-            print(f"✅ {name} - PASSED {details}")
+            self.emit(f"✅ {name} - PASSED {details}")
         else:
-            print(f"❌ {name} - FAILED {details}")
+            self.emit(f"❌ {name} - FAILED {details}")
         return success
 
-    def run_test(self, name: str, method: str, endpoint: str, expected_status: int, 
-                 data: Any = None, files: Dict = None) -> tuple[bool, Dict]:
+    async def run_test(self, name: str, method: str, endpoint: str, expected_status: int, 
+                       data: Any = None, files: Dict = None) -> tuple[bool, Dict]:
         """Run a single API test"""
         url = f"{self.base_url}/{endpoint}"
         headers = {}
         
         try:
             if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=30)
+                response = await self.client.get(url, headers=headers)
             elif method == 'POST':
                 if files:
-                    response = requests.post(url, files=files, timeout=30)
+                    response = await self.client.post(url, files=files)
                 else:
                     headers['Content-Type'] = 'application/json'
-                    response = requests.post(url, json=data, headers=headers, timeout=30)
+                    response = await self.client.post(url, json=data, headers=headers)
             else:
                 return self.log_test(name, False, f"Unsupported method: {method}"), {}
 
@@ -66,24 +113,24 @@ class DQSentinelAPITester:
             
             return self.log_test(name, success, details), response_data
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             return self.log_test(name, False, "Request timeout"), {}
-        except requests.exceptions.ConnectionError:
+        except httpx.ConnectError:
             return self.log_test(name, False, "Connection error"), {}
         except Exception as e:
             return self.log_test(name, False, f"Error: {str(e)}"), {}
 
-    def test_root_endpoint(self):
+    async def test_root_endpoint(self):
         """Test root API endpoint"""
-        success, data = self.run_test("Root Endpoint", "GET", "", 200)
+        success, data = await self.run_test("Root Endpoint", "GET", "", 200)
         if success and data.get('message') == 'DQ Sentinel API':
             return self.log_test("Root Message Check", True, "Correct API message")
         return self.log_test("Root Message Check", False, "Incorrect API message")
 
-    def test_demo_endpoint(self):
+    async def test_demo_endpoint(self):
         """Test demo data generation and DQ checks"""
-        print("\n🔍 Testing Demo Endpoint...")
-        success, data = self.run_test("Demo Generation", "POST", "demo", 200)
+        self.emit("\n🔍 Testing Demo Endpoint...")
+        success, data = await self.run_test("Demo Generation", "POST", "demo", 200)
         
         if success and data:
             # Validate demo response structure
@@ -108,7 +155,9 @@ class DQSentinelAPITester:
             # Check for expected DQ rules
             rule_names = [r.get('rule_name', '') for r in results]
             expected_rules = ['Null Rate:', 'Duplicate Rows', 'Unique Key:', 'Email Regex:', 'Outliers:']
-            found_rules = [rule for rule in expected_rules if any(rule in name for name in rule_names)]
+            # One alternation pass over all names instead of a scan per expected rule
+            rule_re = re.compile('|'.join(map(re.escape, expected_rules)))
+            found_rules = set(rule_re.findall("\n".join(rule_names)))
             
             if len(found_rules) < 3:  # At least 3 rules should be present
                 return self.log_test("Demo DQ Rules", False, f"Expected rules not found. Got: {rule_names}")
@@ -119,10 +168,10 @@ class DQSentinelAPITester:
         
         return False
 
-    def test_runs_list(self):
+    async def test_runs_list(self):
         """Test getting list of runs"""
-        print("\n🔍 Testing Runs List...")
-        success, data = self.run_test("Get Runs List", "GET", "runs", 200)
+        self.emit("\n🔍 Testing Runs List...")
+        success, data = await self.run_test("Get Runs List", "GET", "runs", 200)
         
         if success and data:
             runs = data.get('runs', [])
@@ -131,8 +180,8 @@ class DQSentinelAPITester:
             
             # Check if demo run is in the list
             if self.demo_run_id:
-                demo_found = any(run.get('run_id') == self.demo_run_id for run in runs)
-                if not demo_found:
+                run_ids = {run.get('run_id') for run in runs}
+                if self.demo_run_id not in run_ids:
                     return self.log_test("Demo Run in List", False, "Demo run not found in runs list")
                 self.log_test("Demo Run in List", True)
             
@@ -140,13 +189,13 @@ class DQSentinelAPITester:
         
         return False
 
-    def test_run_details(self):
+    async def test_run_details(self):
         """Test getting specific run details"""
         if not self.demo_run_id:
             return self.log_test("Run Details", False, "No demo run ID available")
         
-        print("\n🔍 Testing Run Details...")
-        success, data = self.run_test("Get Run Details", "GET", f"runs/{self.demo_run_id}", 200)
+        self.emit("\n🔍 Testing Run Details...")
+        success, data = await self.run_test("Get Run Details", "GET", f"runs/{self.demo_run_id}", 200)
         
         if success and data:
             # Validate run details structure
@@ -164,13 +213,13 @@ class DQSentinelAPITester:
         
         return False
 
-    def test_json_report(self):
+    async def test_json_report(self):
         """Test JSON report generation"""
         if not self.demo_run_id:
             return self.log_test("JSON Report", False, "No demo run ID available")
         
-        print("\n🔍 Testing JSON Report...")
-        success, data = self.run_test("Get JSON Report", "GET", f"report/{self.demo_run_id}", 200)
+        self.emit("\n🔍 Testing JSON Report...")
+        success, data = await self.run_test("Get JSON Report", "GET", f"report/{self.demo_run_id}", 200)
         
         if success and data:
             # Validate report structure
@@ -187,15 +236,15 @@ class DQSentinelAPITester:
         
         return False
 
-    def test_html_report(self):
+    async def test_html_report(self):
         """Test HTML report generation"""
         if not self.demo_run_id:
             return self.log_test("HTML Report", False, "No demo run ID available")
         
-        print("\n🔍 Testing HTML Report...")
+        self.emit("\n🔍 Testing HTML Report...")
         try:
             url = f"{self.base_url}/report/{self.demo_run_id}/html"
-            response = requests.get(url, timeout=30)
+            response = await self.client.get(url)
             
             success = response.status_code == 200
             details = f"Status: {response.status_code}"
@@ -232,23 +281,24 @@ class DQSentinelAPITester:
             ['5', 'Charlie Wilson', 'charlie@example.com', '45', '250.50']
         ]
         
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerows(csv_data)
-        
-        csv_bytes = io.BytesIO(output.getvalue().encode('utf-8'))
+        # Encode straight into the byte buffer; detach so the wrapper doesn't close it
+        csv_bytes = io.BytesIO()
+        text = io.TextIOWrapper(csv_bytes, encoding='utf-8', newline='', write_through=True)
+        csv.writer(text).writerows(csv_data)
+        text.detach()
+        csv_bytes.seek(0)
         csv_bytes.name = 'test_data.csv'
         return csv_bytes
 
-    def test_file_upload(self):
+    async def test_file_upload(self):
         """Test CSV file upload"""
-        print("\n🔍 Testing File Upload...")
+        self.emit("\n🔍 Testing File Upload...")
         
         # Create test CSV
         test_csv = self.create_test_csv()
         files = {'file': ('test_data.csv', test_csv, 'text/csv')}
         
-        success, data = self.run_test("Upload CSV File", "POST", "upload", 200, files=files)
+        success, data = await self.run_test("Upload CSV File", "POST", "upload", 200, files=files)
         
         if success and data:
             # Validate upload response
@@ -277,15 +327,15 @@ class DQSentinelAPITester:
         
         return False
 
-    def test_run_checks_on_upload(self):
+    async def test_run_checks_on_upload(self):
         """Test running DQ checks on uploaded dataset"""
         if not self.uploaded_dataset_id:
             return self.log_test("Run Checks on Upload", False, "No uploaded dataset ID available")
         
-        print("\n🔍 Testing DQ Checks on Uploaded Data...")
+        self.emit("\n🔍 Testing DQ Checks on Uploaded Data...")
         
         run_data = {"dataset_id": self.uploaded_dataset_id}
-        success, data = self.run_test("Run DQ Checks", "POST", "run", 200, data=run_data)
+        success, data = await self.run_test("Run DQ Checks", "POST", "run", 200, data=run_data)
         
         if success and data:
             # Validate run response
@@ -320,10 +370,10 @@ class DQSentinelAPITester:
         
         return False
 
-    def test_datasets_endpoint(self):
+    async def test_datasets_endpoint(self):
         """Test getting datasets list"""
-        print("\n🔍 Testing Datasets List...")
-        success, data = self.run_test("Get Datasets", "GET", "datasets", 200)
+        self.emit("\n🔍 Testing Datasets List...")
+        success, data = await self.run_test("Get Datasets", "GET", "datasets", 200)
         
         if success and data:
             datasets = data.get('datasets', [])
@@ -332,8 +382,8 @@ class DQSentinelAPITester:
             
             # Check if uploaded dataset is in the list
             if self.uploaded_dataset_id:
-                dataset_found = any(ds.get('dataset_id') == self.uploaded_dataset_id for ds in datasets)
-                if not dataset_found:
+                dataset_ids = {ds.get('dataset_id') for ds in datasets}
+                if self.uploaded_dataset_id not in dataset_ids:
                     return self.log_test("Uploaded Dataset in List", False, "Uploaded dataset not found")
                 self.log_test("Uploaded Dataset in List", True)
             
@@ -341,43 +391,52 @@ class DQSentinelAPITester:
         
         return False
 
-    def test_invalid_endpoints(self):
+    async def test_invalid_endpoints(self):
         """Test error handling for invalid requests"""
-        print("\n🔍 Testing Error Handling...")
+        self.emit("\n🔍 Testing Error Handling...")
         
         # Test invalid run ID
-        success, _ = self.run_test("Invalid Run ID", "GET", "runs/invalid-id", 404)
+        success, _ = await self.run_test("Invalid Run ID", "GET", "runs/invalid-id", 404)
         
         # Test invalid report ID
-        success2, _ = self.run_test("Invalid Report ID", "GET", "report/invalid-id", 404)
+        success2, _ = await self.run_test("Invalid Report ID", "GET", "report/invalid-id", 404)
         
         # Test run without dataset_id
-        success3, _ = self.run_test("Run Without Dataset ID", "POST", "run", 422, data={})
+        success3, _ = await self.run_test("Run Without Dataset ID", "POST", "run", 422, data={})
         
         return success and success2 and success3
 
-    def run_all_tests(self):
+    async def run_demo_workflow(self):
+        """Generate the demo run, then probe its read endpoints concurrently"""
+        await self.test_demo_endpoint()
+        await asyncio.gather(
+            self.run_buffered(self.test_runs_list()),
+            self.run_buffered(self.test_run_details()),
+            self.run_buffered(self.test_json_report()),
+            self.run_buffered(self.test_html_report()),
+        )
+
+    async def run_upload_workflow(self):
+        """Upload a CSV, run checks on it, then list datasets"""
+        await self.test_file_upload()
+        await self.test_run_checks_on_upload()
+        await self.test_datasets_endpoint()
+
+    async def run_all_tests(self):
         """Run all API tests"""
         print("🚀 Starting DQ Sentinel Backend API Tests")
         print("=" * 60)
         
-        # Basic connectivity
-        self.test_root_endpoint()
-        
-        # Demo workflow
-        self.test_demo_endpoint()
-        self.test_runs_list()
-        self.test_run_details()
-        self.test_json_report()
-        self.test_html_report()
-        
-        # Upload workflow
-        self.test_file_upload()
-        self.test_run_checks_on_upload()
-        self.test_datasets_endpoint()
-        
-        # Error handling
-        self.test_invalid_endpoints()
+        # Connectivity, error handling and both workflows are independent
+        try:
+            await asyncio.gather(
+                self.run_buffered(self.test_root_endpoint()),
+                self.run_buffered(self.test_invalid_endpoints()),
+                self.run_buffered(self.run_demo_workflow()),
+                self.run_buffered(self.run_upload_workflow()),
+            )
+        finally:
+            await self.client.aclose()
         
         # Print summary
         print("\n" + "=" * 60)
@@ -393,7 +452,7 @@ class DQSentinelAPITester:
 def main():
     """Main test runner"""
     tester = DQSentinelAPITester()
-    return tester.run_all_tests()
+    return asyncio.run(tester.run_all_tests())
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
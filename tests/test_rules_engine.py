@@ -0,0 +1,46 @@
+"""
+DQRulesEngine size-dispatch tests: the large-frame paths (thread pool, hashed
+duplicate check, numba IQR outliers) must agree with the small-frame pandas paths
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+# server.py reads these at import time; the client connects lazily, so no MongoDB is needed
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'dq_sentinel_test')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import server  # noqa: E402
+
+
+def _comparable(results):
+    return [
+        (r["rule_name"], r["status"], r["metric"], r["sample_row_indices"])
+        for r in results
+    ]
+
+
+class TestSizeDispatch(unittest.TestCase):
+    def test_large_and_small_paths_agree(self):
+        df = server.generate_ecommerce_demo_data(2 * server.SMALL_DATASET_ROWS)
+
+        large_engine = server.DQRulesEngine(df)
+        self.assertFalse(large_engine._small)
+        large = large_engine.run_all_rules(previous_row_count=None)
+
+        small_engine = server.DQRulesEngine(df)
+        small_engine._small = True  # force the pandas/numpy paths on the same frame
+        small = small_engine.run_all_rules(previous_row_count=None)
+
+        self.assertEqual(_comparable(large), _comparable(small))
+        # The comparison is only meaningful if the dispatched rules actually found violations
+        by_name = {r["rule_name"]: r for r in large}
+        self.assertTrue(by_name["Duplicate Rows"]["sample_row_indices"])
+        self.assertTrue(by_name["Outliers: price"]["sample_row_indices"])
+
+
+if __name__ == '__main__':
+    unittest.main()